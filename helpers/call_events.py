@@ -35,6 +35,7 @@ import asyncio
 
 _sms = CONFIG.sms.instance()
 _db = CONFIG.database.instance()
+_background_tasks: set[asyncio.Task] = set()
 
 
 @tracer.start_as_current_span("on_new_call")
@@ -91,6 +92,11 @@ async def on_call_connected(
         )
     )
     if CONFIG.conversation.initiate.enable_language_choice:
+        # Translate the greeting while the customer picks their language, in background as it is best-effort and should not delay the call
+        prebuild_task = asyncio.create_task(CONFIG.prompts.tts.prebuild_session(call))
+        # Keep a reference, to avoid the task being garbage collected
+        _background_tasks.add(prebuild_task)
+        prebuild_task.add_done_callback(_background_tasks.discard)
         await asyncio.gather(
             _handle_ivr_language(
                 call=call, client=client
@@ -8,6 +8,7 @@ from typing import Optional
 class ModeEnum(str, Enum):
     MEMORY = "memory"
     REDIS = "redis"
+    SQLITE = "sqlite"
 
 
 class MemoryModel(BaseModel, frozen=True):
@@ -34,13 +35,36 @@ class RedisModel(BaseModel, frozen=True):
         return RedisCache(self)
 
 
+class SqliteModel(BaseModel, frozen=True):
+    path: str = ".cache"
+    schema_version: int = 1
+    table: str = "cache"
+    # Cache is on the response path, fail fast when the database is locked
+    timeout_sec: float = 0.1
+
+    def full_path(self) -> str:
+        """
+        Returns the full path to the sqlite database file.
+
+        Formatted as: `{path}-v{schema_version}.sqlite`.
+        """
+        return f"{self.path}-v{self.schema_version}.sqlite"
+
+    @cache
+    def instance(self) -> ICache:
+        from persistence.sqlite import SqliteCache
+
+        return SqliteCache(self)
+
+
 class CacheModel(BaseModel):
     memory: Optional[MemoryModel] = MemoryModel()  # Object is fully defined by default
     mode: ModeEnum = ModeEnum.MEMORY
     redis: Optional[RedisModel] = None
+    sqlite: Optional[SqliteModel] = SqliteModel()  # Object is fully defined by default
 
     @field_validator("redis")
-    def _validate_sqlite(
+    def _validate_redis(
         cls,
         redis: Optional[RedisModel],
         info: ValidationInfo,
@@ -59,10 +83,35 @@ class CacheModel(BaseModel):
             raise ValueError("Memory config required")
         return memory
 
+    @field_validator("sqlite")
+    def _validate_sqlite(
+        cls,
+        sqlite: Optional[SqliteModel],
+        info: ValidationInfo,
+    ) -> Optional[SqliteModel]:
+        if not sqlite and info.data.get("mode", None) == ModeEnum.SQLITE:
+            raise ValueError("SQLite config required")
+        return sqlite
+
     def instance(self) -> ICache:
         if self.mode == ModeEnum.MEMORY:
             assert self.memory
             return self.memory.instance()
 
+        if self.mode == ModeEnum.SQLITE:
+            assert self.sqlite
+            return self.sqlite.instance()
+
         assert self.redis
         return self.redis.instance()
+
+    def persistent_instance(self) -> ICache:
+        """
+        Returns a cache which survives restarts.
+
+        The configured cache is used if it is persistent, otherwise the SQLite cache is used, if configured.
+        """
+        if self.mode == ModeEnum.MEMORY and self.sqlite:
+            return self.sqlite.instance()
+
+        return self.instance()
@@ -1,10 +1,14 @@
 from azure.core.exceptions import HttpResponseError
-from datetime import datetime
-from functools import cached_property
-from html import escape
+from dataclasses import dataclass
+from datetime import datetime, tzinfo
+from functools import cache, cached_property, lru_cache
 from logging import Logger
 from models.call import CallStateModel
-from models.message import MessageModel
+from models.message import (
+    ActionEnum as MessageActionEnum,
+    MessageModel,
+    StyleEnum as MessageStyleEnum,
+)
 from models.next import NextModel
 from models.reminder import ReminderModel
 from models.synthesis import SynthesisModel
@@ -12,11 +16,94 @@ from models.training import TrainingModel
 from openai.types.chat import ChatCompletionSystemMessageParam
 from pydantic import TypeAdapter, BaseModel
 from textwrap import dedent
-from typing import Optional
+from string import Formatter
+from typing import Mapping, Optional
 import json
+import re
+import sys
+import time
 
+_WHITESPACES_R = re.compile(r"\s+")
 
-class SoundModel(BaseModel):
+
+def _collapse(text: str) -> str:
+    """
+    Replace any whitespace sequence, including newlines and indentation, by a single space.
+
+    Newlines are removed to avoid hallucinations issues with GPT-4 Turbo.
+    """
+    return _WHITESPACES_R.sub(" ", text).strip()
+
+
+class _CompiledPrompt:
+    """
+    Prompt template split into literal text and placeholders.
+
+    Rendering only fills the placeholders slots and joins the pieces, the template is not parsed again. Only plain `{name}` placeholders are supported, format specs and conversions are not.
+    """
+
+    _pieces: list[str]
+    _slots: list[tuple[int, str]]
+
+    def __init__(self, prompt_tpl: str):
+        self._pieces = []
+        self._slots = []
+        for literal, field, spec, conversion in Formatter().parse(prompt_tpl):
+            self._pieces.append(literal)
+            if field is None:
+                continue
+            if not field.isidentifier() or spec or conversion:
+                raise ValueError(f'Unsupported placeholder "{field}" in prompt')
+            self._slots.append(
+                (len(self._pieces), sys.intern(field))
+            )  # Interned, like keyword argument names, for pointer-equality lookups
+            self._pieces.append("")
+
+    def render(self, values: Mapping[str, str]) -> str:
+        pieces = self._pieces.copy()
+        for i, field in self._slots:
+            pieces[i] = values[field]
+        return "".join(pieces)
+
+
+@cache
+def _compile(prompt_tpl: str) -> _CompiledPrompt:
+    """
+    Pre-render a prompt template, without its indentation and newlines.
+
+    Templates are constants for the process lifetime, so the result is cached. Only the placeholders remain to be substituted.
+    """
+    return _CompiledPrompt(_collapse(prompt_tpl))
+
+
+@lru_cache(maxsize=64)  # Cache results in memory as the date only changes every minute
+def _format_date(minute: int, tz: tzinfo) -> str:
+    """
+    Format a date, truncated to the minute, in a timezone.
+
+    The date is given as minutes since the epoch.
+    """
+    return datetime.fromtimestamp(minute * 60, tz).strftime("%a %d %b %Y %H:%M (%Z)")
+
+
+# Adapters are costly to build, share them across calls
+_MESSAGES_ADAPTER = TypeAdapter(list[MessageModel])
+_REMINDERS_ADAPTER = TypeAdapter(list[ReminderModel])
+
+# Enums are constant for the process lifetime, join them once
+_ACTIONS_JOINED = ", ".join(action.value for action in MessageActionEnum)
+_STYLES_JOINED = ", ".join(style.value for style in MessageStyleEnum)
+
+# Schemas are constant for the process lifetime, generate them once
+_NEXT_SCHEMA_JSON = json.dumps(NextModel.model_json_schema())
+_SYNTHESIS_SCHEMA_JSON = json.dumps(SynthesisModel.model_json_schema())
+
+# Trainings title, already without newlines
+_TRAININGS_TITLE = "# Internal documentation you can use"
+
+
+@dataclass(frozen=True)
+class SoundModel:
     loading_tpl: str = "{public_url}/loading.wav"
     ready_tpl: str = "{public_url}/ready.wav"
 
@@ -35,7 +122,8 @@ class SoundModel(BaseModel):
         )
 
 
-class LlmModel(BaseModel):
+@dataclass(frozen=True)
+class LlmModel:
     """
     Introduce to Assistant who they are, what they do.
 
@@ -286,37 +374,40 @@ class LlmModel(BaseModel):
     def default_system(self, call: CallStateModel) -> str:
         from helpers.config import CONFIG
 
-        return self._format(
-            self.default_system_tpl.format(
-                bot_company=call.initiate.bot_company,
-                bot_name=call.initiate.bot_name,
-                bot_phone_number=CONFIG.communication_services.phone_number,
-                date=datetime.now(call.tz()).strftime(
-                    "%a %d %b %Y %H:%M (%Z)"
-                ),  # Don't include secs to enhance cache during unit tests.
-                phone_number=call.initiate.phone_number,
-            )
+        return self._default_system(
+            bot_company=call.initiate.bot_company,
+            bot_name=call.initiate.bot_name,
+            bot_phone_number=CONFIG.communication_services.phone_number,
+            date=_format_date(
+                minute=int(time.time() // 60),
+                tz=call.tz(),
+            ),  # Don't include secs to enhance cache during unit tests.
+            phone_number=call.initiate.phone_number,
         )
 
+    @lru_cache(maxsize=128)
+    def _default_system(self, **kwargs: str) -> str:
+        """
+        Render the default system prompt.
+
+        Prompt is shared by all the prompts of a LLM turn, and only changes every minute, so it is cached.
+        """
+        return self._format(self.default_system_tpl, **kwargs)
+
     def chat_system(
         self, call: CallStateModel, trainings: list[TrainingModel]
     ) -> list[ChatCompletionSystemMessageParam]:
-        from models.message import (
-            ActionEnum as MessageActionEnum,
-            StyleEnum as MessageStyleEnum,
-        )
-
         return self._messages(
             self._format(
                 self.chat_system_tpl,
-                actions=", ".join([action.value for action in MessageActionEnum]),
+                actions=_ACTIONS_JOINED,
                 bot_company=call.initiate.bot_company,
-                claim=json.dumps(call.claim),
+                claim=call.claim_json,
                 default_lang=call.lang.human_name,
-                reminders=TypeAdapter(list[ReminderModel])
-                .dump_json(call.reminders, exclude_none=True)
-                .decode(),
-                styles=", ".join([style.value for style in MessageStyleEnum]),
+                reminders=_REMINDERS_ADAPTER.dump_json(
+                    call.reminders, exclude_none=True
+                ).decode(),
+                styles=_STYLES_JOINED,
                 task=call.initiate.task,
                 trainings=trainings,
             ),
@@ -331,14 +422,14 @@ class LlmModel(BaseModel):
                 self.sms_summary_system_tpl,
                 bot_company=call.initiate.bot_company,
                 bot_name=call.initiate.bot_name,
-                claim=json.dumps(call.claim),
+                claim=call.claim_json,
                 default_lang=call.lang.human_name,
-                messages=TypeAdapter(list[MessageModel])
-                .dump_json(call.messages, exclude_none=True)
-                .decode(),
-                reminders=TypeAdapter(list[ReminderModel])
-                .dump_json(call.reminders, exclude_none=True)
-                .decode(),
+                messages=_MESSAGES_ADAPTER.dump_json(
+                    call.messages, exclude_none=True
+                ).decode(),
+                reminders=_REMINDERS_ADAPTER.dump_json(
+                    call.reminders, exclude_none=True
+                ).decode(),
                 task=call.initiate.task,
             ),
             call=call,
@@ -350,14 +441,14 @@ class LlmModel(BaseModel):
         return self._messages(
             self._format(
                 self.synthesis_system_tpl,
-                claim=json.dumps(call.claim),
-                format=json.dumps(SynthesisModel.model_json_schema()),
-                messages=TypeAdapter(list[MessageModel])
-                .dump_json(call.messages, exclude_none=True)
-                .decode(),
-                reminders=TypeAdapter(list[ReminderModel])
-                .dump_json(call.reminders, exclude_none=True)
-                .decode(),
+                claim=call.claim_json,
+                format=_SYNTHESIS_SCHEMA_JSON,
+                messages=_MESSAGES_ADAPTER.dump_json(
+                    call.messages, exclude_none=True
+                ).decode(),
+                reminders=_REMINDERS_ADAPTER.dump_json(
+                    call.reminders, exclude_none=True
+                ).decode(),
                 task=call.initiate.task,
             ),
             call=call,
@@ -374,10 +465,10 @@ class LlmModel(BaseModel):
         return self._messages(
             self._format(
                 self.citations_system_tpl,
-                claim=json.dumps(call.claim),
-                reminders=TypeAdapter(list[ReminderModel])
-                .dump_json(call.reminders, exclude_none=True)
-                .decode(),
+                claim=call.claim_json,
+                reminders=_REMINDERS_ADAPTER.dump_json(
+                    call.reminders, exclude_none=True
+                ).decode(),
                 text=text,
             ),
             call=call,
@@ -389,14 +480,14 @@ class LlmModel(BaseModel):
         return self._messages(
             self._format(
                 self.next_system_tpl,
-                claim=json.dumps(call.claim),
-                format=json.dumps(NextModel.model_json_schema()),
-                messages=TypeAdapter(list[MessageModel])
-                .dump_json(call.messages, exclude_none=True)
-                .decode(),
-                reminders=TypeAdapter(list[ReminderModel])
-                .dump_json(call.reminders, exclude_none=True)
-                .decode(),
+                claim=call.claim_json,
+                format=_NEXT_SCHEMA_JSON,
+                messages=_MESSAGES_ADAPTER.dump_json(
+                    call.messages, exclude_none=True
+                ).decode(),
+                reminders=_REMINDERS_ADAPTER.dump_json(
+                    call.reminders, exclude_none=True
+                ).decode(),
                 task=call.initiate.task,
             ),
             call=call,
@@ -408,44 +499,34 @@ class LlmModel(BaseModel):
         trainings: Optional[list[TrainingModel]] = None,
         **kwargs: str,
     ) -> str:
-        # Remove possible indentation then render the template
-        formatted_prompt = dedent(prompt_tpl.format(**kwargs)).strip()
+        # Render the pre-compiled template, values are cleaned the same way
+        formatted_prompt = _compile(prompt_tpl).render(
+            {key: _collapse(value) for key, value in kwargs.items()}
+        )
 
         # Format trainings, if any
         if trainings:
-            # Format documents for Content Safety scan compatibility
-            # See: https://learn.microsoft.com/en-us/azure/ai-services/openai/concepts/content-filter?tabs=warning%2Cpython-new#embedding-documents-in-your-prompt
-            trainings_str = "\n".join(
+            formatted_prompt = " ".join(
                 [
-                    f"<documents>{escape(training.model_dump_json(exclude=TrainingModel.excluded_fields_for_llm()))}</documents>"
-                    for training in trainings
+                    formatted_prompt,
+                    _TRAININGS_TITLE,
+                    *[training.prompt_fragment() for training in trainings],
                 ]
-            )
-            formatted_prompt += "\n\n# Internal documentation you can use"
-            formatted_prompt += f"\n{trainings_str}"
-
-        # Remove newlines to avoid hallucinations issues with GPT-4 Turbo
-        formatted_prompt = " ".join(
-            [line.strip() for line in formatted_prompt.splitlines()]
-        )
+            )  # Single join, the prompt is copied only once
 
-        self.logger.debug(f"Formatted prompt: {formatted_prompt}")
+        self.logger.debug("Formatted prompt: %s", formatted_prompt)
         return formatted_prompt
 
     def _messages(
         self, system: str, call: CallStateModel
     ) -> list[ChatCompletionSystemMessageParam]:
-        messages = [
-            ChatCompletionSystemMessageParam(
-                content=self.default_system(call),
-                role="system",
-            ),
-            ChatCompletionSystemMessageParam(
-                content=system,
-                role="system",
-            ),
-        ]
-        self.logger.debug(f"Messages: {messages}")
+        messages: list[ChatCompletionSystemMessageParam] = [
+            {
+                "content": f"{self.default_system(call)} {system}",
+                "role": "system",
+            },
+        ]  # Single message, to save the per-message tokens overhead
+        self.logger.debug("Messages: %s", messages)
         return messages
 
     @cached_property
@@ -455,7 +536,8 @@ class LlmModel(BaseModel):
         return logger
 
 
-class TtsModel(BaseModel):
+@dataclass(frozen=True)
+class TtsModel:
     tts_lang: str = "fr-FR"
     calltransfer_failure_tpl: str = (
         "Il semble que je ne puisse pas vous mettre en relation avec un agent pour le moment, mais le prochain agent disponible vous rappellera dès que possible."
@@ -529,17 +611,50 @@ class TtsModel(BaseModel):
         return await self._translate(self.timeout_loading_tpl, call)
 
     async def ivr_language(self, call: CallStateModel) -> str:
-        res = ""
-        for i, lang in enumerate(call.initiate.lang.availables):
-            res += (
+        res = " ".join(
+            [
                 self._return(
                     self.ivr_language_tpl,
                     index=i + 1,
                     label=lang.human_name,
                 )
-                + " "
+                for i, lang in enumerate(call.initiate.lang.availables)
+            ]
+        )
+        return await self._translate(res, call)
+
+    async def prebuild_session(self, call: CallStateModel) -> None:
+        """
+        Translate the greeting prompt to all the available languages.
+
+        Only the prompt played once the customer picked their language is translated, in a single request for all the languages. Translations are stored in the translation cache, so the greeting is served without network round-trip.
+
+        This is best-effort: if the translation fails, the error is logged and the prompt will be translated on use.
+        """
+        from helpers.config import CONFIG
+        from helpers.translation import translate_texts_all
+
+        if len(call.messages) <= 1:  # First call, or only the call action
+            initial = self._return(
+                self.hello_tpl,
+                bot_company=call.initiate.bot_company,
+                bot_name=call.initiate.bot_name,
+            )
+        else:  # Returning call
+            initial = self._return(
+                self.welcome_back_tpl,
+                bot_company=call.initiate.bot_company,
+                bot_name=call.initiate.bot_name,
+                conversation_timeout_hour=CONFIG.conversation.callback_timeout_hour,
+            )
+        try:
+            await translate_texts_all(
+                [initial],
+                self.tts_lang,
+                [lang.short_code for lang in call.initiate.lang.availables],
             )
-        return await self._translate(res.strip(), call)
+        except Exception:  # Pre-translation is optional, never fail the call
+            self.logger.warning("Failed to pre-translate TTS prompts", exc_info=True)
 
     def _return(self, prompt_tpl: str, **kwargs) -> str:
         """
@@ -2,6 +2,7 @@ from azure.ai.translation.text.aio import TextTranslationClient
 from azure.ai.translation.text.models import TranslatedTextItem
 from azure.core.credentials import AzureKeyCredential
 from azure.core.exceptions import HttpResponseError
+from collections import OrderedDict
 from helpers.http import azure_transport
 from helpers.config import CONFIG
 from helpers.logging import logger
@@ -16,9 +17,40 @@ from tenacity import (
 
 logger.info(f"Using Translation {CONFIG.ai_translation.endpoint}")
 
-_cache = CONFIG.cache.instance()
+_cache = (
+    CONFIG.cache.persistent_instance()
+)  # Translations are stable, keep them across restarts
 _client = Optional[TextTranslationClient]
 
+# Translations already seen by this process, by text, source and target languages
+# Prompts are the same for every call, so most of them are served without cache nor network round-trip. Least recently used are removed first.
+_memo: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+_MEMO_MAX_SIZE = 1000
+
+
+async def translate_text(
+    text: str, source_lang: str, target_lang: str
+) -> Optional[str]:
+    """
+    Translate text from source language to target language.
+
+    Catch errors for a maximum of 3 times.
+    """
+    return (await translate_texts([text], source_lang, target_lang))[0]
+
+
+async def translate_texts(
+    texts: list[str], source_lang: str, target_lang: str
+) -> list[Optional[str]]:
+    """
+    Translate multiple texts from source language to target language.
+
+    Results are returned in the same order as the inputs.
+
+    Catch errors for a maximum of 3 times.
+    """
+    return (await translate_texts_all(texts, source_lang, [target_lang]))[target_lang]
+
 
 @retry(
     reraise=True,
@@ -26,39 +58,85 @@ _client = Optional[TextTranslationClient]
     stop=stop_after_attempt(3),
     wait=wait_random_exponential(multiplier=0.8, max=8),
 )
-async def translate_text(
-    text: str, source_lang: str, target_lang: str
-) -> Optional[str]:
+async def translate_texts_all(
+    texts: list[str], source_lang: str, target_langs: list[str]
+) -> dict[str, list[Optional[str]]]:
     """
-    Translate text from source language to target language.
+    Translate multiple texts from source language to multiple target languages.
+
+    Texts are first searched in the process memory, then in the cache. Missing ones are translated in a single request, for all the target languages. Results are returned by target language, in the same order as the inputs.
 
     Catch errors for a maximum of 3 times.
     """
-    if source_lang == target_lang:  # No need to translate
-        return text
-
-    # Try cache
-    cache_key = f"{__name__}-translate_text-{text}-{source_lang}-{target_lang}"
-    cached = await _cache.aget(cache_key)
-    if cached:
-        return cached.decode()
+    # Try memory, then cache
+    translations: dict[str, list[Optional[str]]] = {}
+    for target_lang in target_langs:
+        if source_lang == target_lang:  # No need to translate
+            translations[target_lang] = list(texts)
+            continue
+        translations[target_lang] = []
+        for text in texts:
+            translated = _memo_get(text, source_lang, target_lang)
+            if translated is None:
+                cached = await _cache.aget(_cache_key(text, source_lang, target_lang))
+                if cached is not None:
+                    translated = cached.decode()
+                    _memo_set(text, source_lang, target_lang, translated)
+            translations[target_lang].append(translated)
+    missing_langs = [
+        target_lang
+        for target_lang, res in translations.items()
+        if target_lang != source_lang and any(text is None for text in res)
+    ]  # Empty translations are valid, only cache misses are missing
+    missing_texts = [
+        i
+        for i in range(len(texts))
+        if any(translations[target_lang][i] is None for target_lang in missing_langs)
+    ]
+    if not missing_langs:
+        return translations
 
     # Try live
-    translation: Optional[str] = None
     client = await _use_client()
     res: list[TranslatedTextItem] = await client.translate(
-        body=[text],
+        body=[texts[i] for i in missing_texts],
         from_language=source_lang,
-        to_language=[target_lang],
+        to_language=missing_langs,
     )
-    translation = res[0].translations[0].text if res and res[0].translations else None
+    for i, item in zip(missing_texts, res):
+        for target_lang, translation in zip(
+            missing_langs, item.translations or []
+        ):  # Translations are in the same order as the target languages
+            translations[target_lang][i] = translation.text
+            # Update memory and cache
+            _memo_set(texts[i], source_lang, target_lang, translation.text)
+            await _cache.aset(
+                _cache_key(texts[i], source_lang, target_lang), translation.text
+            )
 
-    # Update cache
-    await _cache.aset(cache_key, translation)
+    return translations
 
+
+def _memo_get(text: str, source_lang: str, target_lang: str) -> Optional[str]:
+    key = (text, source_lang, target_lang)
+    translation = _memo.get(key, None)
+    if translation is not None:
+        _memo.move_to_end(key)  # Move to last
     return translation
 
 
+def _memo_set(text: str, source_lang: str, target_lang: str, translation: str) -> None:
+    key = (text, source_lang, target_lang)
+    if key not in _memo and len(_memo) >= _MEMO_MAX_SIZE:
+        _memo.popitem(last=False)  # Delete the first
+    _memo[key] = translation
+    _memo.move_to_end(key)  # Move to last
+
+
+def _cache_key(text: str, source_lang: str, target_lang: str) -> str:
+    return f"{__name__}-translate_text-{text}-{source_lang}-{target_lang}"
+
+
 async def _use_client() -> TextTranslationClient:
     """
     Generate the Translation client and close it after use.
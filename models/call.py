@@ -7,10 +7,17 @@ from models.next import NextModel
 from models.reminder import ReminderModel
 from models.synthesis import SynthesisModel
 from models.training import TrainingModel
-from pydantic import BaseModel, Field, computed_field, field_validator, ValidationInfo
+from pydantic import (
+    BaseModel,
+    computed_field,
+    Field,
+    field_validator,
+    ValidationInfo,
+)
 from typing import Any, Optional
 from uuid import UUID, uuid4
 import asyncio
+import orjson
 import random
 import string
 
@@ -83,6 +90,13 @@ class CallStateModel(CallGetModel, extra="ignore"):
     lang_short_code: Optional[str] = None
     recognition_retry: int = 0
 
+    @property
+    def claim_json(self) -> str:
+        """
+        Get the claim serialized as JSON.
+        """
+        return orjson.dumps(self.claim).decode()
+
     @computed_field
     @property
     def lang(self) -> LanguageEntryModel:  # type: ignore
@@ -1,5 +1,6 @@
 from datetime import datetime
 from functools import total_ordering
+from html import escape
 from uuid import UUID
 from pydantic import BaseModel
 
@@ -32,9 +33,22 @@ class TrainingModel(BaseModel, frozen=True):
             return NotImplemented
         return self.score < other.score
 
+    def prompt_fragment(self) -> str:
+        """
+        Returns the document as a LLM prompt fragment.
+
+        Documents are wrapped for Content Safety scan compatibility.
+
+        See: https://learn.microsoft.com/en-us/azure/ai-services/openai/concepts/content-filter?tabs=warning%2Cpython-new#embedding-documents-in-your-prompt
+        """
+        return f"<documents>{escape(self.model_dump_json(exclude=_EXCLUDED_FIELDS_FOR_LLM))}</documents>"
+
     @staticmethod
     def excluded_fields_for_llm() -> set[str]:
         """
         Returns fields that should be excluded from sending to LLM because they are not relevant for document understanding.
         """
         return {"id", "file_path", "score", "created_at"}
+
+
+_EXCLUDED_FIELDS_FOR_LLM = TrainingModel.excluded_fields_for_llm()
@@ -1,6 +1,7 @@
-from aiosqlite import connect as sqlite_connect, Connection
+from aiosqlite import connect as sqlite_connect, Connection, Error as SqliteError
 from contextlib import asynccontextmanager
 from helpers.config import CONFIG
+from helpers.config_models.cache import SqliteModel as CacheSqliteModel
 from helpers.config_models.database import SqliteModel
 from helpers.logging import logger
 from models.call import CallStateModel
@@ -9,9 +10,10 @@ from opentelemetry.instrumentation.sqlite3 import SQLite3Instrumentor
 from persistence.icache import ICache
 from persistence.istore import IStore
 from pydantic import ValidationError
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Optional, Union
 from uuid import UUID
 import asyncio
+import hashlib
 import os
 
 
@@ -257,3 +259,149 @@ class SqliteStore(IStore):
             if self._first_run_done:
                 await self._init_db(client)
             yield client
+
+
+class SqliteCache(ICache):
+    """
+    A persistent cache, stored in a local SQLite database.
+
+    Values survive restarts, which is useful for a single instance without an external cache like Redis.
+    """
+
+    _config: CacheSqliteModel
+    _db_path: str
+    _init_done: bool
+    _init_lock: asyncio.Lock
+
+    def __init__(self, config: CacheSqliteModel):
+        logger.info(f"Using SQLite cache at {config.path} with table {config.table}")
+        self._config = config
+        self._init_done = False
+        self._init_lock = asyncio.Lock()
+
+        # Create folder if does not exist
+        self._db_path = self._config.full_path()
+        db_folder = os.path.dirname(self._db_path)
+        if db_folder:
+            os.makedirs(name=db_folder, exist_ok=True)
+
+    async def areadiness(self) -> ReadinessEnum:
+        """
+        Check the readiness of the SQLite cache.
+
+        This checks if the database is reachable and can be queried.
+        """
+        try:
+            async with self._use_db() as db:
+                await db.execute("SELECT 1")
+            return ReadinessEnum.OK
+        except Exception:
+            logger.error("Unknown error while checking SQLite readiness", exc_info=True)
+        return ReadinessEnum.FAIL
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        """
+        Get a value from the cache.
+
+        If the key does not exist or if the key exists but the value is empty, return `None`.
+
+        Errors are logged and `None` is returned, the cache fails soft.
+        """
+        sha_key = self._key_to_hash(key)
+        res = None
+        try:
+            async with self._use_db() as db:
+                cursor = await db.execute(
+                    f"SELECT value FROM {self._config.table} WHERE key = ?",
+                    (sha_key,),
+                )
+                row = await cursor.fetchone()
+            res = row[0] if row and row[0] else None
+        except SqliteError as e:
+            logger.error(f"Error getting value: {e}")
+        return res
+
+    async def aset(self, key: str, value: Union[str, bytes, None]) -> bool:
+        """
+        Set a value in the cache.
+
+        Errors are logged and `False` is returned, the cache fails soft.
+        """
+        sha_key = self._key_to_hash(key)
+        try:
+            async with self._use_db() as db:
+                await db.execute(
+                    f"INSERT OR REPLACE INTO {self._config.table} VALUES (?, ?)",
+                    (
+                        sha_key,  # key
+                        (value.encode() if isinstance(value, str) else value),  # value
+                    ),
+                )
+                await db.commit()
+        except SqliteError as e:
+            logger.error(f"Error setting value: {e}")
+            return False
+        return True
+
+    async def adel(self, key: str) -> bool:
+        """
+        Delete a value from the cache.
+
+        Errors are logged and `False` is returned, the cache fails soft.
+        """
+        sha_key = self._key_to_hash(key)
+        try:
+            async with self._use_db() as db:
+                await db.execute(
+                    f"DELETE FROM {self._config.table} WHERE key = ?",
+                    (sha_key,),
+                )
+                await db.commit()
+        except SqliteError as e:
+            logger.error(f"Error deleting value: {e}")
+            return False
+        return True
+
+    async def _init_db(self, db: Connection):
+        """
+        Initialize the database.
+
+        See: https://sqlite.org/cgi/src/doc/wal2/doc/wal2.md
+        """
+        logger.info("Init cache database")
+        # Optimize performance for concurrent writes
+        await db.execute("PRAGMA journal_mode=WAL")
+        # Create table
+        await db.execute(
+            f"CREATE TABLE IF NOT EXISTS {self._config.table} (key VARCHAR(64) PRIMARY KEY, value BLOB)"
+        )
+        # Write changes to disk
+        await db.commit()
+        # Init is done, don't run it again for the next connections
+        self._init_done = True
+
+    @asynccontextmanager
+    async def _use_db(self) -> AsyncGenerator[Connection, None]:
+        """
+        Generate the SQLite client and close it after use.
+
+        Database is initialized once per process, even if the file already exists, as it can have been created by another process or with another table.
+        """
+        async with sqlite_connect(
+            database=self._db_path,
+            timeout=self._config.timeout_sec,
+        ) as client:
+            if not self._init_done:
+                async with self._init_lock:  # Concurrent connections wait for a single init
+                    if not self._init_done:
+                        await self._init_db(client)
+            yield client
+
+    @staticmethod
+    def _key_to_hash(key: str) -> str:
+        """
+        Transform the key into a hash.
+
+        SHA-256 lower the collision probability. Plus, it reduce the key size, which is useful for disk usage.
+        """
+        return hashlib.sha256(key.encode(), usedforsecurity=False).hexdigest()
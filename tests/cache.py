@@ -15,6 +15,10 @@ import pytest
             CacheModeEnum.REDIS,
             id="redis",
         ),
+        pytest.param(
+            CacheModeEnum.SQLITE,
+            id="sqlite",
+        ),
     ],
 )
 @pytest.mark.asyncio(scope="session")
@@ -0,0 +1,174 @@
+from azure.ai.translation.text.models import TranslatedTextItem
+from azure.core.exceptions import HttpResponseError
+from collections import OrderedDict
+from helpers.config_models.cache import MemoryModel as CacheMemoryModel
+from persistence.memory import MemoryCache
+from pytest import assume
+import helpers.translation
+import pytest
+
+
+class TextTranslationClientMock:
+    """
+    Translate by suffixing the text with the target language, and record the requests.
+    """
+
+    error: bool = False
+    requests: list[tuple[list[str], str, list[str]]]
+
+    def __init__(self) -> None:
+        self.requests = []
+
+    async def translate(
+        self,
+        body: list[str],
+        from_language: str,
+        to_language: list[str],
+        *args,
+        **kwargs,
+    ) -> list[TranslatedTextItem]:
+        self.requests.append((body, from_language, to_language))
+        if self.error:
+            raise HttpResponseError(message="Mocked error")
+        return [
+            TranslatedTextItem(
+                {
+                    "translations": [
+                        {"text": _translated(text, lang), "to": lang}
+                        for lang in to_language
+                    ]
+                }
+            )
+            for text in body
+        ]
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> TextTranslationClientMock:
+    client = TextTranslationClientMock()
+
+    async def _use_client() -> TextTranslationClientMock:
+        return client
+
+    monkeypatch.setattr(helpers.translation, "_use_client", _use_client)
+    monkeypatch.setattr(helpers.translation, "_cache", MemoryCache(CacheMemoryModel()))
+    monkeypatch.setattr(helpers.translation, "_memo", OrderedDict())
+    return client
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_translate_all(
+    client: TextTranslationClientMock, random_text: str
+) -> None:
+    """
+    Test batch translation to multiple languages.
+
+    Steps:
+    1. Translate texts to multiple languages, including the source language and an empty text
+    2. Check a single request is made, without the source language
+    3. Check results are in the input order
+    4. Translate again
+    5. Check no request is made
+    """
+    # Empty text is not a cache miss when not translated
+    texts = [f"{random_text}-{i}" for i in range(3)] + [""]
+    target_langs = ["en-US", "fr-FR", "es-ES"]
+
+    # Translate
+    res = await helpers.translation.translate_texts_all(texts, "fr-FR", target_langs)
+
+    # Check a single request, without the source language
+    assume(len(client.requests) == 1)
+    assume(client.requests[0] == (texts, "fr-FR", ["en-US", "es-ES"]))
+    # Check order
+    assume(res["fr-FR"] == texts)
+    for lang in ["en-US", "es-ES"]:
+        assume(res[lang] == [_translated(text, lang) for text in texts])
+
+    # Translate again
+    res_cached = await helpers.translation.translate_texts_all(
+        texts, "fr-FR", target_langs
+    )
+
+    # Check cache hits skip the network
+    assume(len(client.requests) == 1)
+    assume(res_cached == res)
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_translate_partial_cache(
+    client: TextTranslationClientMock, random_text: str
+) -> None:
+    """
+    Test only the cache misses are translated.
+
+    Steps:
+    1. Translate a text to a language
+    2. Translate it with another text to the same language
+    3. Check only the new text is requested
+    4. Check results are in the input order
+    """
+    texts = [f"{random_text}-a", f"{random_text}-b"]
+
+    # Warm up the cache for the second text
+    await helpers.translation.translate_text(texts[1], "fr-FR", "en-US")
+
+    # Translate both
+    res = await helpers.translation.translate_texts(texts, "fr-FR", "en-US")
+
+    # Check only the miss is requested
+    assume(len(client.requests) == 2)
+    assume(client.requests[1] == ([texts[0]], "fr-FR", ["en-US"]))
+    # Check order
+    assume(res == [_translated(text, "en-US") for text in texts])
+
+
+@pytest.mark.asyncio(scope="session")
+async def test_translate_memo(
+    client: TextTranslationClientMock,
+    monkeypatch: pytest.MonkeyPatch,
+    random_text: str,
+) -> None:
+    """
+    Test translations are kept in memory.
+
+    Steps:
+    1. Translate a text
+    2. Check it is served from memory, without cache nor network
+    3. Translate more texts than the memory size
+    4. Check the least recently used is evicted
+    5. Translate with a failing service
+    6. Check the failure is not kept in memory
+    """
+    monkeypatch.setattr(helpers.translation, "_MEMO_MAX_SIZE", 2)
+    texts = [f"{random_text}-{i}" for i in range(3)]
+
+    # Translate
+    await helpers.translation.translate_text(texts[0], "fr-FR", "en-US")
+    await helpers.translation._cache.adel(
+        helpers.translation._cache_key(texts[0], "fr-FR", "en-US")
+    )
+
+    # Check memory hit
+    res = await helpers.translation.translate_text(texts[0], "fr-FR", "en-US")
+    assume(res == _translated(texts[0], "en-US"))
+    assume(len(client.requests) == 1)
+
+    # Fill the memory
+    await helpers.translation.translate_texts(texts[1:], "fr-FR", "en-US")
+
+    # Check eviction
+    assume(len(helpers.translation._memo) == 2)
+    assume((texts[0], "fr-FR", "en-US") not in helpers.translation._memo)
+
+    # Translate with errors
+    client.error = True
+    with pytest.raises(HttpResponseError):
+        await helpers.translation.translate_text(random_text, "fr-FR", "es-ES")
+
+    # Check failure is not kept
+    assume((random_text, "fr-FR", "es-ES") not in helpers.translation._memo)
+
+
+def _translated(text: str, lang: str) -> str:
+    return f"{text} ({lang})"